@@ -1,14 +1,25 @@
-from flask import Flask, send_from_directory
+from flask import Flask, Response, abort, request
+import hashlib
 import os
 
 app = Flask(__name__)
 
+# The UI is a single static page — read it once and serve the bytes from memory
+try:
+    with open(os.path.join(os.path.dirname(__file__), "index.html"), "rb") as f:
+        _UI_BYTES = f.read()
+    _ETAG = hashlib.md5(_UI_BYTES).hexdigest()
+except OSError:
+    _UI_BYTES = _ETAG = None
+
 @app.route("/")
 def home():
-    return send_from_directory(
-        os.path.join(os.path.dirname(__file__), "templates"),
-        "golf_booker_ui.html"
-    )
+    if _UI_BYTES is None:
+        abort(404)
+    headers = {"ETag": f'"{_ETAG}"', "Cache-Control": "public, max-age=300"}
+    if _ETAG in request.if_none_match:
+        return Response(status=304, headers=headers)
+    return Response(_UI_BYTES, mimetype="text/html", headers=headers)
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
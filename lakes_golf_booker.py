@@ -5,12 +5,14 @@ Generated: 27/02/2026 | Mode: Book Group
 Runs via GitHub Actions automatically
 """
 
-import os, sys, re, logging
+import os, sys, re, json, time, random, asyncio, argparse, logging
 from datetime import datetime
-from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
-load_dotenv()
+# Local runs read credentials from .env; GitHub Actions already has them in the environment
+if os.path.isfile(".env"):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 CONFIG = {
     "username":      os.getenv("GOLF_USERNAME"),  # Set GOLF_USERNAME in GitHub Secrets
@@ -21,196 +23,385 @@ CONFIG = {
     "earliest_time": "13:30",
     "latest_time":   "14:00",
     "headless":      True,               # Must be True on GitHub Actions (no display)
+    "debug":         False,              # Log page diagnostics and per-row errors
+    "state_file":    "lakes_state.json", # Saved login session, reused between runs
+    "session_ttl_hours": 4,              # Max age of a saved session whose cookies carry no expiry
     "login_url":     "https://www.thelakesgolfclub.com.au/security/login.msp",
     "booking_url":   "https://www.thelakesgolfclub.com.au/members/bookings/index.xsp?booking_resource_id=3000000",
 }
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)s  %(message)s")
+logging.basicConfig(level=logging.DEBUG if CONFIG["debug"] else logging.INFO, format="%(asctime)s  %(levelname)s  %(message)s")
 log = logging.getLogger("golf_booker")
 
-def time_in_window(t_str):
+# Tee-sheet selectors, reused for every row
+ROWID_SEL      = "[data-rowid]"
+BTN_LABEL_SEL  = "span.btn-label"
+BOOK_GROUP_SEL = "button.btn-book-group:not(.hide)"
+BOOK_ME_SEL    = "button.btn-book-me:not(.hide)"
+CELL_TAKEN_SEL = "div.cell-taken"
+# Confirmation buttons, anywhere on the page, in the order they are tried. Labels must
+# match exactly: a substring "OK" would also hit every "BOOK GROUP" button on the sheet.
+CONFIRM_LABELS = ("Confirm", "OK", "Yes", "Submit")
+CONFIRM_RE     = re.compile(rf"^({'|'.join(CONFIRM_LABELS)})$", re.I)
+
+# Login form fields — the first element matching any alternative is used. The generic
+# text input is only a fallback, or a header search box earlier in the page would win.
+USERNAME_SEL = ('input[name="memberLogin"], input[name="username"], input[name="MembershipNo"], '
+                'input[name="member_login"], input[name="login"], input[id="memberLogin"], '
+                'input[id="username"], input[id="MembershipNo"]')
+USERNAME_FALLBACK_SEL = 'input[type="text"]:visible'
+PASSWORD_SEL = 'input[name="memberPassword"], input[name="password"], input[type="password"]'
+SUBMIT_SEL   = 'input[type="submit"], button[type="submit"], button:has-text("Login")'
+
+def to_minutes(hhmm):
+    # "13:30" -> 810 minutes since midnight
+    h, m = hhmm.strip().split(":")
+    return int(h) * 60 + int(m)
+
+# Snapshots taken in a single evaluate() instead of one round-trip per element
+FIND_DATE_JS = """(label) => {
+    const blocks = document.querySelectorAll(".full");
+    for (let i = 0; i < blocks.length; i++) {
+        if (!blocks[i].innerText.includes(label)) continue;
+        const a = blocks[i].querySelector("a.eventStatusOpen");
+        return { idx: i, href: a ? a.getAttribute("href") : null };
+    }
+    return null;
+}"""
+# Picks the bookable row closest to the middle of the time window in a single call:
+# tee, window, mode and button are all checked in the browser. Rows whose index is
+# in `skip` were already tried.
+PICK_ROW_JS = rf"""(rows, [lo, hi, teeText, mode, skip]) => {{
+    const timeRe = /\b(\d{{1,2}}):(\d{{2}})\s*(am|pm)\b/i;
+    const mid = (lo + hi) / 2;
+    let best = null, bestDist = Infinity;
+    for (let i = 0; i < rows.length; i++) {{
+        if (skip.includes(i)) continue;
+        const r = rows[i], text = r.innerText;
+        if (teeText && !text.includes(teeText)) continue;
+        if (!r.querySelector("{ROWID_SEL}")) continue;
+        const m = text.match(timeRe);
+        if (!m) continue;
+        const h = Number(m[1]) % 12 + (m[3].toLowerCase() === "pm" ? 12 : 0);
+        const mins = h * 60 + Number(m[2]);
+        if (mins < lo || mins > hi) continue;
+        const taken = r.querySelectorAll("{CELL_TAKEN_SEL}").length > 0;
+        if (mode === "new" && taken) continue;
+        if (mode === "join" && !taken) continue;
+        if (Math.abs(mins - mid) >= bestDist) continue;
+        if (!r.querySelector(mode === "group" ? "{BOOK_GROUP_SEL}" : "{BOOK_ME_SEL}")) continue;
+        bestDist = Math.abs(mins - mid);
+        best = {{ i, time: m[1] + ":" + m[2] + " " + m[3].toUpperCase(), taken,
+                 freeSpots: r.querySelectorAll("{BTN_LABEL_SEL}").length }};
+    }}
+    return {{ rows: rows.length, match: best }};
+}}"""
+TEE_TEXT = {"1ST TEE": "1st Tee", "10TH TEE": "10th Tee"}
+
+# Nothing the booker reads needs these, so they are never downloaded.
+# Stylesheets still load: the :visible checks on the login form depend on them.
+BLOCKED_RESOURCES = {"image", "media", "font"}
+BLOCKED_HOSTS_RE  = re.compile(r"google-analytics|googletagmanager|doubleclick|facebook\.net|hotjar")
+SESSION_COOKIE_RE = re.compile(r"sess", re.I)  # JSESSIONID, ASP.NET_SessionId, PHPSESSID, ...
+LAUNCH_ARGS       = ["--disable-blink-features=AutomationControlled", "--disable-dev-shm-usage", "--no-sandbox",
+                     "--disable-gpu", "--disable-extensions", "--disable-background-networking",
+                     "--disable-features=Translate,BackForwardCache"]
+
+async def goto(page, url, attempts=4):
+    # Navigates, retrying 5xx/429 with jittered exponential backoff (honouring Retry-After):
+    # the club's server is at its busiest right when bookings open.
+    for i in range(attempts):
+        resp = await page.goto(url, wait_until="domcontentloaded")
+        if resp is None or (resp.status < 500 and resp.status != 429) or i == attempts - 1:
+            return resp
+        retry_after = resp.headers.get("retry-after", "")
+        delay = float(retry_after) if retry_after.isdigit() else 0.2 * 2 ** i * random.uniform(0.5, 1.5)
+        delay = min(8.0, delay)
+        log.warning(f"HTTP {resp.status} from {url}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+async def block_unneeded(route):
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCES or BLOCKED_HOSTS_RE.search(req.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+def is_booking_response(resp):
+    # The booking request the site fires once a slot is taken
+    return "booking" in resp.url and resp.request.method == "POST"
+
+async def click_confirm(page):
+    # Clicks the first visible confirmation button by label priority
+    for label in CONFIRM_LABELS:
+        btn = page.get_by_role("button", name=re.compile(rf"^{label}$", re.I))
+        try:
+            if await btn.count():
+                await btn.first.click(timeout=2000)
+                log.info("  Confirmation clicked")
+                return True
+        except PlaywrightTimeoutError:
+            continue
+    return False
+
+async def submit_booking(page, btn):
+    # Clicks a book button and returns the booking response (None if none arrives).
+    # Only a failed click raises; after that any error just means the booking is unconfirmed.
+    # A confirmation is only clicked through if its button shows up before the response:
+    # nothing is clicked speculatively, so there is never a stray click to cancel.
+    response = asyncio.create_task(page.wait_for_event("response", predicate=is_booking_response, timeout=10000))
+    confirm = None
     try:
-        t  = datetime.strptime(t_str.strip().zfill(5), "%H:%M").time()
-        lo = datetime.strptime(CONFIG["earliest_time"], "%H:%M").time()
-        hi = datetime.strptime(CONFIG["latest_time"],   "%H:%M").time()
-        return lo <= t <= hi
-    except ValueError:
+        await btn.click()
+        try:
+            confirm = asyncio.create_task(page.get_by_role("button", name=CONFIRM_RE).first.wait_for(timeout=10000))
+            await asyncio.wait({response, confirm}, return_when=asyncio.FIRST_COMPLETED)
+            if not response.done() and confirm.exception() is None:
+                await click_confirm(page)
+        except Exception as e:
+            log.warning(f"  Error after clicking: {e}")
+        try:
+            return await response
+        except Exception:  # timed out, or the page went away
+            return None
+    finally:
+        # Both tasks only wait on the page, so cancelling them is safe
+        tasks = [t for t in (response, confirm) if t is not None]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def login(page):
+    # Fills and submits the login form; returns False if we're still on the login page
+    log.info("Logging in...")
+    await goto(page, CONFIG["login_url"])
+    log.debug(f"Login page URL: {page.url}")
+    named = page.locator(USERNAME_SEL)
+    try:
+        await named.or_(page.locator(USERNAME_FALLBACK_SEL)).first.wait_for(timeout=5000)
+        field = named.first if await named.count() else page.locator(USERNAME_FALLBACK_SEL).first
+        await field.fill(CONFIG["username"], timeout=5000)
+    except PlaywrightTimeoutError:
+        log.error("Could not find username field"); await page.screenshot(path="login_failed.png"); return False
+    await page.locator(PASSWORD_SEL).first.fill(CONFIG["password"])
+    await page.locator(SUBMIT_SEL).first.click()
+    try:
+        await page.wait_for_url(lambda url: "login" not in url.lower(), wait_until="domcontentloaded", timeout=10000)
+    except PlaywrightTimeoutError:
+        pass  # still on the login page — reported below
+    title = await page.title()
+    log.info(f"Post-login URL: {page.url}")
+    log.info(f"Post-login title: {title}")
+    if "login" in page.url.lower() or "login" in title.lower():
+        log.error("Login failed — still on login page. Check GOLF_USERNAME / GOLF_PASSWORD secrets.")
+        await page.screenshot(path="login_failed.png"); return False
+    log.info("Logged in successfully.")
+    await page.context.storage_state(path=CONFIG["state_file"])
+    return True
+
+def saved_session_is_fresh():
+    # Trusts the club's session cookie expiry when it has one, otherwise the age of the file.
+    # Other long-lived club cookies say nothing about whether the login is still valid.
+    path = CONFIG["state_file"]
+    try:
+        with open(path, encoding="utf-8") as f:
+            cookies = json.load(f).get("cookies", [])
+    except (OSError, ValueError):
         return False
+    expiries = [c.get("expires", -1) for c in cookies
+                if "thelakesgolfclub" in c.get("domain", "") and SESSION_COOKIE_RE.search(c.get("name", ""))]
+    if expiries and all(e > 0 for e in expiries):
+        return min(expiries) - time.time() > 60
+    return time.time() - os.path.getmtime(path) < CONFIG["session_ttl_hours"] * 3600
 
-def row_has_players(tee_row):
-    # Returns True if any cell has class cell-taken (player already booked)
-    return tee_row.locator("div.cell-taken").count() > 0
+async def book_pass(page, book_mode, lo_min, hi_min, skip):
+    # One scan pass of the open tee sheet for a single mode, never touching the rows in `skip`.
+    # Returns (row index, confirmed) for the row clicked, or None if nothing was booked.
+    # A booking is only confirmed by the site's booking request; without one it may or may not have gone through.
+    tee_filter = CONFIG["tee"]
+    btn_label  = "Book Group" if book_mode == "group" else "Book Me"
+    await page.wait_for_selector("div.row-time", timeout=10000)
+    tee_rows = page.locator("div.row-time")
 
-def run():
-    target_date = datetime.strptime(CONFIG["booking_date"], "%Y-%m-%d")
-    book_mode   = CONFIG["book_mode"]
-    tee_filter  = CONFIG["tee"]
-    btn_label   = "Book Group" if book_mode == "group" else "Book Me"
-    # strftime "%-d" removes leading zero on Linux; "%#d" on Windows
-    import platform
-    fmt = "%#d %b" if platform.system() == "Windows" else "%-d %b"
-    date_label = target_date.strftime(fmt)
+    tried = list(skip)
+    while True:
+        scan = await tee_rows.evaluate_all(PICK_ROW_JS, [lo_min, hi_min, TEE_TEXT.get(tee_filter), book_mode, tried])
+        if len(tried) == len(skip):
+            log.info(f"Found {scan['rows']} tee time rows")
+        pick = scan["match"]
+        if pick is None:
+            return None
+        tried.append(pick["i"])
+        raw_time = pick["time"]
+        log.info(f"  {raw_time} ({tee_filter}): has_players={pick['taken']}, free_spots={pick['freeSpots']}")
+        btn = tee_rows.nth(pick["i"]).locator(BOOK_GROUP_SEL if book_mode == "group" else BOOK_ME_SEL).first
+
+        log.info(f"  Clicking '{btn_label}' at {raw_time}...")
+        try:
+            resp = await submit_booking(page, btn)
+        except Exception as e:
+            # The button itself couldn't be clicked, so nothing was booked on this row
+            log.debug(f"  Row error: {e}")
+            continue
+        if resp is None:
+            log.warning(f"  No booking request seen after clicking '{btn_label}' at {raw_time} — unconfirmed")
+            return pick["i"], False
+        if not resp.ok:
+            log.warning(f"  Booking request failed (HTTP {resp.status}), trying next row")
+            continue
+
+        log.info(f"  ✅ Booked '{btn_label}' at {raw_time}!")
+        return pick["i"], True
+
+async def book_date(page, target_date, modes, window):
+    # Books one play date on an already logged-in page, one scan pass per mode in order.
+    # Returns True if any mode booked, False if none did, None if the date isn't bookable
+    # at all or a booking couldn't be confirmed.
+    lo_min, hi_min = (to_minutes(t) for t in window)
+    date_label = f"{target_date.day} {target_date:%b}"  # e.g. "6 Mar", no leading zero
+    day        = f"{target_date:%Y%m%d}"
     log.info("=" * 50)
     log.info(f"Target:  {target_date.strftime('%A %d %B %Y')}")
-    log.info(f"Mode:    {btn_label}  |  Tee: {tee_filter}")
-    log.info(f"Window:  {CONFIG['earliest_time']}–{CONFIG['latest_time']}")
+    log.info(f"Modes:   {', '.join(modes)}  |  Tee: {CONFIG['tee']}")
+    log.info(f"Window:  {window[0]}–{window[1]}")
     log.info("=" * 50)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=CONFIG["headless"])
-        page    = browser.new_context().new_page()
-        # ── LOGIN ───────────────────────────────────────────
-        log.info("Logging in...")
-        page.goto(CONFIG["login_url"], wait_until="networkidle")
-        page.wait_for_timeout(2000)
-        log.info(f"Login page URL: {page.url}")
-        filled_user = False
-        for sel in ['input[name="memberLogin"]', 'input[name="username"]', 'input[name="MembershipNo"]', 'input[type="text"]:visible']:
-            if page.locator(sel).count() > 0:
-                page.fill(sel, CONFIG["username"])
-                log.info(f"Filled username into: {sel}")
-                filled_user = True; break
-        if not filled_user:
-            log.error("Could not find username field"); page.screenshot(path="login_failed.png"); browser.close(); sys.exit(1)
-        for sel in ['input[name="memberPassword"]', 'input[name="password"]', 'input[type="password"]']:
-            if page.locator(sel).count() > 0:
-                page.fill(sel, CONFIG["password"]); break
-        for sel in ['input[type="submit"]', 'button[type="submit"]', 'button:has-text("Login")']:
-            if page.locator(sel).count() > 0:
-                page.click(sel); break
-        page.wait_for_load_state("networkidle")
-        page.wait_for_timeout(2000)
-        log.info(f"Post-login URL: {page.url}")
-        log.info(f"Post-login title: {page.title()}")
-        if "login" in page.url.lower() or "login" in page.title().lower():
-            log.error("Login failed — still on login page. Check GOLF_USERNAME / GOLF_PASSWORD secrets.")
-            page.screenshot(path="login_failed.png"); browser.close(); sys.exit(1)
-        log.info("Logged in successfully.")
-
-        # ── NAVIGATE TO BOOKING PAGE ─────────────────────────
-        page.goto(CONFIG["booking_url"], wait_until="networkidle")
-        page.wait_for_timeout(6000)  # extra wait for calendar to render
-
-        # ── FIND TARGET DATE ────────────────────────────────
-        log.info(f"Looking for date: {date_label}")
-        log.info(f"Page title: {page.title()}")
-        log.info(f"Page URL: {page.url}")
-        booked = False
-        try:
-            page.wait_for_selector(".full", timeout=20000)
-            event_blocks = page.locator(".full").all()
-            log.info(f"Found {len(event_blocks)} event blocks on page")
-            found = False
-            for block in event_blocks:
-                try:
-                    block_text = block.inner_text(timeout=500)
-                    if date_label not in block_text:
-                        continue
-                    log.info(f"Found block containing {date_label}")
-                    open_link = block.locator("a.eventStatusOpen").first
-                    if open_link.count() == 0:
-                        log.warning("Date found but not OPEN (may be LOCKED or VIEW ONLY)")
-                        page.screenshot(path="not_open.png")
-                        browser.close(); sys.exit(1)
-                    href = open_link.get_attribute("href")
-                    log.info(f"Navigating to: {href}")
-                    page.goto(f"https://www.thelakesgolfclub.com.au{href}", wait_until="networkidle")
-                    page.wait_for_timeout(3000)
-                    found = True
-                    break
-                except Exception as e:
-                    log.debug(f"Block error: {e}")
-                    continue
-            if not found:
-                log.warning(f"Date {date_label} not found on page")
-                page.screenshot(path="date_not_found.png")
-                browser.close(); sys.exit(1)
-
-            # ── SCAN TEE SHEET ──────────────────────────────────
-            page.wait_for_selector("div.row-time", timeout=10000)
-            page.wait_for_timeout(2000)
-            tee_rows = page.locator("div.row-time").all()
-            log.info(f"Found {len(tee_rows)} tee time rows")
-
-            for tee_row in tee_rows:
-                try:
-                    row_text = tee_row.inner_text(timeout=500)
-
-                    if tee_filter == "1ST TEE" and "1st Tee" not in row_text:
-                        continue
-                    if tee_filter == "10TH TEE" and "10th Tee" not in row_text:
-                        continue
-
-                    times = re.findall(r'\b(\d{1,2}:\d{2})\s*(am|pm)\b', row_text, re.IGNORECASE)
-                    if not times:
-                        continue
-                    raw_time = times[0][0] + " " + times[0][1].upper()
-                    try:
-                        t24 = datetime.strptime(raw_time, "%I:%M %p").strftime("%H:%M")
-                    except Exception:
-                        t24 = times[0][0].zfill(5)
-
-                    if not time_in_window(t24):
-                        continue
-
-                    cells = tee_row.locator("[data-rowid]").all()
-                    if not cells:
-                        continue
-
-                    has_players  = row_has_players(tee_row)
-                    free_spots   = tee_row.locator("span.btn-label").count()
-                    log.info(f"  {raw_time} ({tee_filter}): has_players={has_players}, free_spots={free_spots}")
-
-                    if book_mode == "new" and has_players:
-                        log.info(f"  Skipping {raw_time} — row has existing players (mode=new)")
-                        continue
-                    if book_mode == "join" and not has_players:
-                        log.info(f"  Skipping {raw_time} — no existing players (mode=join)")
-                        continue
-
-                    if book_mode == "group":
-                        btn = tee_row.locator("button.btn-book-group:not(.hide)").first
-                    else:
-                        btn = tee_row.locator("button.btn-book-me:not(.hide)").first
-
-                    if btn.count() == 0:
-                        log.debug("  Button not available, skipping")
-                        continue
-
-                    log.info(f"  Clicking '{btn_label}' at {raw_time}...")
-                    btn.click()
-                    page.wait_for_load_state("networkidle")
-                    page.wait_for_timeout(2000)
-
-                    for cs in ['button:has-text("Confirm")', 'button:has-text("OK")', 'button:has-text("Yes")', 'button:has-text("Submit")']:
-                        try:
-                            cb = page.locator(cs).first
-                            if cb.is_visible(timeout=2000):
-                                cb.click(); page.wait_for_load_state("networkidle")
-                                log.info("  Confirmation clicked"); break
-                        except Exception: continue
-
-                    booked = True
-                    log.info(f"  ✅ Booked '{btn_label}' at {raw_time}!")
-                    break
-
-                except Exception as e:
-                    log.debug(f"  Row error: {e}")
-                    continue
+    if page.url != CONFIG["booking_url"]:
+        await goto(page, CONFIG["booking_url"])
 
+    # ── FIND TARGET DATE ────────────────────────────────
+    log.info(f"Looking for date: {date_label}")
+    if CONFIG["debug"]:
+        log.debug(f"Page title: {await page.title()}")
+        log.debug(f"Page URL: {page.url}")
+    await page.wait_for_selector(".full", timeout=20000)
+    hit = await page.evaluate(FIND_DATE_JS, date_label)
+    if hit is None:
+        log.warning(f"Date {date_label} not found on page")
+        await page.screenshot(path=f"date_not_found_{day}.png")
+        return None
+    log.info(f"Found block containing {date_label}")
+    if not hit["href"]:
+        log.warning("Date found but not OPEN (may be LOCKED or VIEW ONLY)")
+        await page.screenshot(path=f"not_open_{day}.png")
+        return None
+    event_url = f"https://www.thelakesgolfclub.com.au{hit['href']}"
+    log.info(f"Navigating to: {event_url}")
+    await goto(page, event_url)
+    sheet_url = page.url
+
+    # ── SCAN TEE SHEET, ONE PASS PER MODE ───────────────
+    # Modes run one after another so two of them can never grab the same row
+    # Unconfirmed rows are skipped too: they may well be booked.
+    booked_rows, unconfirmed = [], False
+    for book_mode in modes:
+        status = "failed"
+        try:
+            if page.url != sheet_url:
+                await goto(page, sheet_url)
+            result = await book_pass(page, book_mode, lo_min, hi_min, booked_rows)
+            if result is not None:
+                row, confirmed = result
+                booked_rows.append(row)
+                status = "success" if confirmed else "unconfirmed"
         except Exception as e:
-            log.warning(f"Booking error: {e}")
+            log.warning(f"Booking error ({book_mode}): {e}")
 
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        fn = f"booking_{'success' if booked else 'failed'}_{ts}.png"
-        page.screenshot(path=fn, full_page=True)
+        fn = f"booking_{status}_{day}_{book_mode}_{ts}.png"
+        # Viewport is enough to prove a booking; keep the full page for everything else
+        await page.screenshot(path=fn, full_page=status != "success")
         log.info(f"Screenshot saved: {fn}")
-        browser.close()
 
-    if booked:
-        log.info("✅ Tee time booked successfully!")
-    else:
-        log.warning("❌ No booking made — check screenshot for details.")
+        if status == "success":
+            log.info(f"✅ Tee time booked successfully ({book_mode})!")
+        elif status == "unconfirmed":
+            unconfirmed = True
+            log.warning(f"⚠️ Booking unconfirmed ({book_mode}) — check screenshot and the club site.")
+        else:
+            log.warning(f"❌ No booking made ({book_mode}) — check screenshot for details.")
+    return None if unconfirmed else bool(booked_rows)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Book tee times at The Lakes Golf Club.")
+    parser.add_argument("--date", dest="dates", action="append", metavar="YYYY-MM-DD",
+                        help="play date to book; repeat to book several dates in one browser session "
+                             f"(default: {CONFIG['booking_date']})")
+    parser.add_argument("--mode", default=CONFIG["book_mode"], metavar="MODE[,MODE...]",
+                        help="group, new or join; a comma-separated list books each mode in turn, on different rows "
+                             f"(default: {CONFIG['book_mode']})")
+    parser.add_argument("--earliest", default=CONFIG["earliest_time"], metavar="HH:MM",
+                        help=f"earliest tee time to book (default: {CONFIG['earliest_time']})")
+    parser.add_argument("--latest", default=CONFIG["latest_time"], metavar="HH:MM",
+                        help=f"latest tee time to book (default: {CONFIG['latest_time']})")
+    args = parser.parse_args()
+    # Duplicates are dropped so no two jobs can race for the same tee time
+    args.dates = [datetime.strptime(d, "%Y-%m-%d") for d in dict.fromkeys(args.dates or [CONFIG["booking_date"]])]
+    args.modes = list(dict.fromkeys(args.mode.split(",")))
+    for mode in args.modes:
+        if mode not in ("group", "new", "join"):
+            parser.error(f"unknown mode {mode!r} (choose from group, new, join)")
+    for t in (args.earliest, args.latest):
+        try:
+            to_minutes(t)
+        except ValueError:
+            parser.error(f"bad time {t!r}, expected HH:MM")
+    return args
+
+async def open_context(browser, storage_state=None):
+    context = await browser.new_context(storage_state=storage_state)
+    await context.route("**/*", block_unneeded)
+    return context
+
+async def attempt(browser, target_date, modes, window, page=None):
+    # Each date runs in its own context, started from the saved login session
+    if page is None:
+        page = await (await open_context(browser, CONFIG["state_file"])).new_page()
+    try:
+        return await book_date(page, target_date, modes, window)
+    finally:
+        await page.context.close()
+
+async def main():
+    args = parse_args()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=CONFIG["headless"], args=LAUNCH_ARGS)
+        reuse   = saved_session_is_fresh()
+        context = await open_context(browser, CONFIG["state_file"] if reuse else None)
+        page    = await context.new_page()
+
+        # ── LOG IN (ONCE FOR ALL DATES) ──────────────────────
+        logged_in = False
+        if reuse:
+            log.info(f"Reusing saved session from {CONFIG['state_file']}")
+            await goto(page, CONFIG["booking_url"])
+            title = await page.title()
+            logged_in = ("login" not in page.url.lower() and "login" not in title.lower()
+                         and not await page.locator('input[name="memberPassword"]').first.is_visible())
+            if not logged_in:
+                log.info("Saved session has expired.")
+        if not logged_in and not await login(page):
+            await browser.close(); sys.exit(1)
+
+        # One job per date, booking its modes in turn. The first reuses the logged-in page;
+        # the rest run alongside it in fresh contexts. An exception in one job must not
+        # cancel the others mid-booking, so it is collected as that job's result.
+        window = (args.earliest, args.latest)
+        first_date, *rest = args.dates
+        results = await asyncio.gather(attempt(browser, first_date, args.modes, window, page),
+                                       *(attempt(browser, d, args.modes, window) for d in rest),
+                                       return_exceptions=True)
+        await browser.close()
+
+    for d, result in zip(args.dates, results):
+        if isinstance(result, Exception):
+            log.error(f"Booking {d:%d %b} failed: {result}")
+    if any(r is None or isinstance(r, Exception) for r in results):
+        sys.exit(1)
+
+def run():
+    asyncio.run(main())
 
 if __name__ == "__main__":
     run()